@@ -14,7 +14,7 @@ from datetime import datetime
 PIPELINE_ROOT = Path(__file__).parent.parent
 sys.path.insert(0, str(PIPELINE_ROOT))
 
-from core.systemfairy import run_systemfairy, ensure_requirements
+from core.systemfairy import run_systemfairy, run_systemfairy_cached, ensure_requirements
 from core.matlab_runner import run_matlab_analysis
 from core.figure_generator import generate_all_figures
 from core.qmd_generator import generate_qmd_report
@@ -290,11 +290,16 @@ def run_pipeline(input_path: Path, tracks: list, output_dir: Path):
 
 def main():
     """Main entry point."""
+    # Flags may appear anywhere; the rest are commands
+    args = sys.argv[1:]
+    force_recheck = '--force-recheck' in args
+    args = [arg for arg in args if arg != '--force-recheck']
+    
     # Check for special commands
-    if len(sys.argv) > 1:
-        cmd = sys.argv[1].lower()
+    if args:
+        cmd = args[0].lower()
         if cmd in ('check', 'systemfairy', '--check'):
-            run_systemfairy(verbose=True)
+            run_systemfairy(verbose=True, detailed=True)
             return 0
         elif cmd in ('install', '--install'):
             return install_dependencies()
@@ -305,7 +310,7 @@ def main():
     try:
         # Run environment check first
         print()
-        ok, missing = run_systemfairy(verbose=True)
+        ok, missing = run_systemfairy_cached(verbose=True, force_recheck=force_recheck)
         
         if not ok:
             print()
@@ -364,6 +369,9 @@ Usage:
   python mason_cli.py install      Install Python dependencies
   python mason_cli.py help         Show this help
 
+Options:
+  --force-recheck    Re-probe the environment even if it passed in the last 24h
+
 Or double-click: mason_analysis.bat
 
 Track Selection Syntax:
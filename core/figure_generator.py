@@ -9,50 +9,69 @@ warnings.filterwarnings('ignore', category=DeprecationWarning)
 import numpy as np
 import matplotlib
 matplotlib.use('Agg')  # Non-interactive backend
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 from matplotlib.colors import LinearSegmentedColormap
+from matplotlib.collections import LineCollection
 import h5py
 import json
+import threading
 from pathlib import Path
-from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
+TRACK_DATASETS = ('SpeedRunVel', 'times', 'xpos', 'ypos', 'eti')
+TRACK_FIELDS = TRACK_DATASETS + ('eset_name', 'lengthPerPixel', 'reversals')
+FIGURE_FIELDS = TRACK_DATASETS + ('reversals',)  # What the plots actually use
+H5_CHUNK_CACHE_BYTES = 4 * 1024 * 1024
 
-def load_track_data(track_dir):
-    """Load track data from .h5 file"""
+# Per-thread figure cache so each worker reuses its Figures across tracks
+_thread_figures = threading.local()
+
+
+def load_track_data(track_dir, fields=TRACK_FIELDS):
+    """
+    Load track data from .h5 file.
+    
+    Args:
+        track_dir: Directory containing track_data.h5
+        fields: Datasets/attributes to read; track_num is always loaded
+    """
     track_dir = Path(track_dir)
     h5_file = track_dir / 'track_data.h5'
     
     if not h5_file.exists():
         raise FileNotFoundError(f"No track_data.h5 found in {track_dir}")
     
-    with h5py.File(str(h5_file), 'r') as f:
-        data = {
-            'track_num': int(np.asarray(f['track_num']).flat[0]),
-            'SpeedRunVel': f['SpeedRunVel'][:].ravel(),
-            'times': f['times'][:].ravel(),
-            'xpos': f['xpos'][:].ravel(),
-            'ypos': f['ypos'][:].ravel(),
-            'eti': f['eti'][:].ravel(),
-        }
-        
-        data['eset_name'] = f.attrs.get('eset_name', 'unknown')
-        if isinstance(data['eset_name'], bytes):
-            data['eset_name'] = data['eset_name'].decode('utf-8')
+    # Raise the raw chunk cache above h5py's 1 MB default so each dataset
+    # is pulled in whole-chunk reads
+    with h5py.File(str(h5_file), 'r', rdcc_nbytes=H5_CHUNK_CACHE_BYTES) as f:
+        data = {'track_num': int(np.asarray(f['track_num']).flat[0])}
+        # float32 is ample for 150 DPI figures and halves memory traffic
+        data.update({
+            name: f[name][...].ravel().astype(np.float32, copy=False)
+            for name in TRACK_DATASETS if name in fields
+        })
         
-        data['lengthPerPixel'] = f.attrs.get('lengthPerPixel', 0.01)
+        if 'eset_name' in fields:
+            data['eset_name'] = f.attrs.get('eset_name', 'unknown')
+            if isinstance(data['eset_name'], bytes):
+                data['eset_name'] = data['eset_name'].decode('utf-8')
         
-        reversals = []
-        if 'reversals' in f:
-            rev_group = f['reversals']
-            for key in sorted(rev_group.keys(), key=lambda x: int(x.replace('reversal_', ''))):
-                rev_data = rev_group[key]
-                rev_dict = {}
-                for field in rev_data.attrs:
-                    val = rev_data.attrs[field]
-                    rev_dict[field] = float(np.asarray(val).flat[0]) if hasattr(val, '__iter__') else float(val)
-                reversals.append(rev_dict)
+        if 'lengthPerPixel' in fields:
+            data['lengthPerPixel'] = f.attrs.get('lengthPerPixel', 0.01)
         
-        data['reversals'] = reversals
+        if 'reversals' in fields:
+            reversals = []
+            if 'reversals' in f:
+                rev_items = sorted((int(key.split('_')[1]), rev_data) for key, rev_data in f['reversals'].items())
+                for _, rev_data in rev_items:
+                    # Snapshot all attributes in one HDF5 call, then convert in Python
+                    attrs = dict(rev_data.attrs)
+                    reversals.append({
+                        field: float(np.asarray(val).flat[0]) if hasattr(val, '__iter__') else float(val)
+                        for field, val in attrs.items()
+                    })
+            
+            data['reversals'] = reversals
         
     return data
 
@@ -66,39 +85,103 @@ def create_speed_colormap():
     return LinearSegmentedColormap.from_list('speed_heatmap', colors, N=256)
 
 
+# Built once; colormaps are read-only when called so threads can share it
+SPEED_CMAP = create_speed_colormap()
+
+
 def format_time_mmss(seconds):
     """Format seconds as MM:SS"""
     return f"{int(seconds // 60):02d}:{int(seconds % 60):02d}"
 
 
-def plot_dot_product(track_data, output_path):
+def get_figure(name, figsize, facecolor, fig=None):
+    """
+    Get a cleared Figure for a plot, reusing this thread's cached instance.
+    
+    Args:
+        name: Plot kind, used with figsize as the cache key
+        figsize: Figure size in inches
+        facecolor: Figure background color
+        fig: Caller-supplied Figure to clear and use instead of the cache
+    """
+    if fig is None:
+        figures = getattr(_thread_figures, 'figures', None)
+        if figures is None:
+            figures = _thread_figures.figures = {}
+        fig = figures.get((name, figsize))
+        if fig is None:
+            fig = figures[(name, figsize)] = Figure(figsize=figsize, facecolor=facecolor)
+            return fig
+    fig.clear()
+    return fig
+
+
+def reversal_mask(reversals, n_segments):
+    """Boolean mask of segments falling inside any reversal [start_idx, end_idx)"""
+    if not reversals:
+        return np.zeros(n_segments, dtype=bool)
+    
+    starts = np.array([int(r.get('start_idx', 0)) for r in reversals])
+    ends = np.array([int(r.get('end_idx', n_segments + 1)) for r in reversals])
+    
+    # Sort by start; the running max of ends lets overlapping reversals merge
+    order = np.argsort(starts, kind='stable')
+    starts, reach = starts[order], np.maximum.accumulate(ends[order])
+    
+    # Map each segment to the last reversal starting at or before it
+    idx = np.arange(n_segments)
+    pos = np.searchsorted(starts, idx, side='right') - 1
+    return (pos >= 0) & (idx < reach[np.maximum(pos, 0)])
+
+
+def classify_segments(xpos, ypos, eti, reversals):
+    """
+    Classify trajectory segments for speed coloring.
+    
+    Returns:
+        Tuple of (speed_norm, in_reversal, moving), one entry per segment:
+        normalized speed in [0, 1], reversal membership, and speed > 0
+    """
+    # Speeds from finite differences, zero where dt <= 0
+    dx, dy, dt = np.diff(xpos), np.diff(ypos), np.diff(eti)
+    valid_dt = dt > 0
+    speeds = np.where(valid_dt, np.hypot(dx, dy) / np.where(valid_dt, dt, 1) * 10, 0.0)
+    
+    moving = speeds > 0
+    speed_min = speeds[moving].min() if moving.any() else 0
+    speed_max = speeds.max() if speeds.size > 0 else 1
+    speed_norm = (speeds - speed_min) / (speed_max - speed_min + 1e-10)
+    
+    return speed_norm, reversal_mask(reversals, len(speeds)), moving
+
+
+def plot_dot_product(track_data, output_path, fig=None):
     """Generate dot product time series plot with reversal table"""
     times = track_data['times']
     SpeedRunVel = track_data['SpeedRunVel']
     reversals = track_data['reversals']
     track_num = track_data['track_num']
     
-    # Build reversal table data
-    reversal_table_data = []
-    for rev in reversals:
-        start_idx = int(rev.get('start_idx', 0))
-        end_idx = int(rev.get('end_idx', len(times)))
-        if 0 <= start_idx < len(times) and 0 <= end_idx <= len(times):
-            rev_times = times[start_idx:end_idx]
-            if len(rev_times) > 0:
-                duration = float(rev_times[-1] - rev_times[0])
-                if duration >= 3.0:
-                    reversal_table_data.append({
-                        'start': rev_times[0], 'end': rev_times[-1],
-                        'duration': duration, 'start_idx': start_idx, 'end_idx': end_idx
-                    })
+    # Build reversal table data (non-empty, in-range reversals lasting >= 3s)
+    starts = np.fromiter((int(r.get('start_idx', 0)) for r in reversals), dtype=int, count=len(reversals))
+    ends = np.fromiter((int(r.get('end_idx', len(times))) for r in reversals), dtype=int, count=len(reversals))
+    valid = (starts >= 0) & (starts < ends) & (ends <= len(times))
+    starts, ends = starts[valid], ends[valid]
+    durations = times[ends - 1] - times[starts]
+    keep = durations >= 3.0
+    reversal_table_data = [
+        {'start': times[s], 'end': times[e - 1], 'duration': float(d), 'start_idx': int(s), 'end_idx': int(e)}
+        for s, e, d in zip(starts[keep], ends[keep], durations[keep])
+    ]
     
     if reversal_table_data:
-        fig = plt.figure(figsize=(10, 8), facecolor='white')
+        fig = get_figure('dot_product', (10, 8), 'white', fig)
+        fig.subplots_adjust(left=0.08, right=0.97, top=0.95, bottom=0.04)
         gs = fig.add_gridspec(2, 1, height_ratios=[3, 1], hspace=0.3)
         ax = fig.add_subplot(gs[0])
     else:
-        fig = plt.figure(figsize=(10, 6), facecolor='white')
+        fig = get_figure('dot_product', (10, 6), 'white', fig)
+        fig.subplots_adjust(left=0.08, right=0.97, top=0.93, bottom=0.1)
         ax = fig.add_subplot(111)
     
     ax.set_facecolor('white')
@@ -136,43 +219,32 @@ def plot_dot_product(track_data, output_path):
         for i in range(4):
             table[(0, i)].set_facecolor('#E0E0E0')
     
-    plt.savefig(output_path, dpi=150, bbox_inches='tight', facecolor='white')
-    plt.close()
+    fig.savefig(output_path, dpi=150, facecolor='white')
 
 
-def plot_trajectory(track_data, output_path):
+def plot_trajectory(track_data, output_path, fig=None, dpi=150):
     """Generate trajectory plot with speed coloring"""
-    fig = plt.figure(figsize=(9, 9), facecolor=[0.2, 0.2, 0.2])
+    fig = get_figure('trajectory', (9, 9), [0.2, 0.2, 0.2], fig)
+    fig.subplots_adjust(left=0.1, right=0.97, top=0.94, bottom=0.07)
     ax = fig.add_subplot(111, facecolor=[0.2, 0.2, 0.2])
     
     xpos, ypos, eti = track_data['xpos'], track_data['ypos'], track_data['eti']
     reversals = track_data['reversals']
     
-    # Compute speeds
-    speeds = []
-    for i in range(len(xpos) - 1):
-        dx, dy = xpos[i+1] - xpos[i], ypos[i+1] - ypos[i]
-        dt = eti[i+1] - eti[i] if i+1 < len(eti) else 1
-        speeds.append(np.sqrt(dx**2 + dy**2) / dt * 10 if dt > 0 else 0)
-    
-    speeds = np.array(speeds)
-    speed_min = speeds[speeds > 0].min() if np.any(speeds > 0) else 0
-    speed_max = speeds.max() if len(speeds) > 0 else 1
-    
-    speed_cmap = create_speed_colormap()
-    uv_color = np.array([0.5, 0, 1])  # Purple for reversals
-    
-    # Plot trajectory segments
-    for i in range(len(xpos) - 1):
-        if i < len(speeds) and speeds[i] > 0:
-            speed_norm = (speeds[i] - speed_min) / (speed_max - speed_min + 1e-10)
-            line_color = speed_cmap(speed_norm)
-            # Check if in reversal
-            for rev in reversals:
-                if int(rev.get('start_idx', 0)) <= i < int(rev.get('end_idx', len(xpos))):
-                    line_color = uv_color
-                    break
-            ax.plot([xpos[i], xpos[i+1]], [ypos[i], ypos[i+1]], color=line_color, linewidth=2)
+    speed_norm, in_reversal, moving = classify_segments(xpos, ypos, eti, reversals)
+    uv_color = np.array([0.5, 0, 1, 1])  # Purple for reversals
+    
+    # Per-segment colors: speed heatmap, overridden inside reversals
+    colors = SPEED_CMAP(speed_norm)
+    colors[in_reversal] = uv_color
+    
+    # Plot trajectory segments (stationary segments are skipped)
+    points = np.column_stack([xpos, ypos])
+    segments = np.stack([points[:-1], points[1:]], axis=1)
+    trajectory_lines = LineCollection(segments[moving], colors=colors[moving], linewidths=2)
+    trajectory_lines.set_rasterized(True)  # One raster blit, even in vector output
+    ax.add_collection(trajectory_lines)
+    ax.autoscale_view()
     
     ax.set_xlabel('X (cm)', fontsize=12, color='white')
     ax.set_ylabel('Y (cm)', fontsize=12, color='white')
@@ -181,14 +253,12 @@ def plot_trajectory(track_data, output_path):
     for spine in ax.spines.values():
         spine.set_color('white')
     ax.grid(True, alpha=0.3, color=[0.5, 0.5, 0.5])
-    ax.set_aspect('equal')
+    ax.set_aspect('equal', adjustable='datalim')  # Fill the fixed axes box
     
-    plt.tight_layout()
-    plt.savefig(output_path, dpi=150, bbox_inches='tight', facecolor=[0.2, 0.2, 0.2])
-    plt.close()
+    fig.savefig(output_path, dpi=dpi, facecolor=[0.2, 0.2, 0.2])
 
 
-def plot_reversal_closeup(track_data, reversal_idx, output_path):
+def plot_reversal_closeup(track_data, reversal_idx, output_path, fig=None):
     """Generate close-up dot product for a specific reversal"""
     times, SpeedRunVel = track_data['times'], track_data['SpeedRunVel']
     reversals = track_data['reversals']
@@ -199,7 +269,9 @@ def plot_reversal_closeup(track_data, reversal_idx, output_path):
     rev = reversals[reversal_idx]
     start_idx, end_idx = int(rev.get('start_idx', 0)), int(rev.get('end_idx', len(times)))
     
-    fig, ax = plt.subplots(figsize=(8, 5), facecolor='white')
+    fig = get_figure('reversal_closeup', (8, 5), 'white', fig)
+    fig.subplots_adjust(left=0.1, right=0.97, top=0.92, bottom=0.12)
+    ax = fig.add_subplot(111)
     padding = int(0.1 * (end_idx - start_idx))
     view_start, view_end = max(0, start_idx - padding), min(len(times), end_idx + padding)
     
@@ -212,22 +284,20 @@ def plot_reversal_closeup(track_data, reversal_idx, output_path):
     ax.set_title(f'Track {track_data["track_num"]} - Reversal {reversal_idx + 1}', fontweight='bold')
     ax.grid(True, alpha=0.3)
     
-    plt.tight_layout()
-    plt.savefig(output_path, dpi=150, bbox_inches='tight', facecolor='white')
-    plt.close()
+    fig.savefig(output_path, dpi=150, facecolor='white')
 
 
 def process_single_track(args):
-    """Process a single track - called by parallel executor"""
+    """Process a single track - called by the figure thread pool"""
     track_num, results_dir, figures_dir = args
-    track_dir = Path(results_dir) / f'track{track_num}'
+    track_dir = results_dir / f'track{track_num}'
     
     if not track_dir.exists():
         return {'track_num': track_num, 'status': 'not_found', 'reversals': 0}
     
     try:
-        data = load_track_data(track_dir)
-        track_fig_dir = Path(figures_dir) / f'track{track_num}'
+        data = load_track_data(track_dir, fields=FIGURE_FIELDS)
+        track_fig_dir = figures_dir / f'track{track_num}'
         track_fig_dir.mkdir(exist_ok=True)
         
         # Generate main figures
@@ -279,9 +349,11 @@ def generate_all_figures(results_dir: Path, figures_dir: Path, tracks: list = No
     args_list = [(t, results_dir, figures_dir) for t in tracks]
     
     results = []
-    max_workers = min(4, len(tracks))
+    # Threads avoid per-worker interpreter startup and re-imports; figures are
+    # built with the object API, so no pyplot global state is shared
+    max_workers = min(8, len(tracks))
     
-    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
         futures = {executor.submit(process_single_track, args): args[0] for args in args_list}
         for future in as_completed(futures):
             track_num = futures[future]
@@ -2,11 +2,47 @@
 MATLAB Runner - Executes MATLAB headless for Mason analysis.
 """
 
+import os
+import signal
 import subprocess
 import sys
 import json
+import threading
 from pathlib import Path
 
+_PIPELINE_ROOT = Path(__file__).resolve().parent.parent
+MATLAB_TIMEOUT = 3600  # 1 hour timeout
+
+# Start MATLAB in its own process group so the whole tree can be killed
+if sys.platform == 'win32':
+    _PROCESS_GROUP = {'creationflags': subprocess.CREATE_NEW_PROCESS_GROUP}
+else:
+    _PROCESS_GROUP = {'start_new_session': True}
+
+
+def _kill_process_tree(process):
+    """
+    Kill MATLAB and everything it started.
+    
+    The launcher hands off to a child MATLAB process that inherits the
+    output pipe, so killing only the direct child leaves the pipe open.
+    """
+    if sys.platform == 'win32':
+        subprocess.run(
+            ['taskkill', '/T', '/F', '/PID', str(process.pid)],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL
+        )
+    else:
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+    
+    # Fallback if the group kill did not reach the direct child
+    if process.poll() is None:
+        process.kill()
+
 
 def run_matlab_analysis(input_path: Path, tracks: list, output_dir: Path) -> bool:
     """
@@ -25,8 +61,7 @@ def run_matlab_analysis(input_path: Path, tracks: list, output_dir: Path) -> boo
     output_dir.mkdir(parents=True, exist_ok=True)
     
     # Find the MATLAB script
-    pipeline_root = Path(__file__).parent.parent
-    matlab_script = pipeline_root / 'matlab' / 'mason_analysis.m'
+    matlab_script = _PIPELINE_ROOT / 'matlab' / 'mason_analysis.m'
     
     if not matlab_script.exists():
         print(f"ERROR: MATLAB script not found: {matlab_script}")
@@ -61,7 +96,7 @@ def run_matlab_analysis(input_path: Path, tracks: list, output_dir: Path) -> boo
     matlab_cmd = f"mason_analysis('{expt_path}', '{track_str}', '{str(output_dir)}')"
     
     # Add script directory to MATLAB path
-    matlab_full_cmd = f"addpath('{pipeline_root / 'matlab'}'); {matlab_cmd}; exit;"
+    matlab_full_cmd = f"addpath('{_PIPELINE_ROOT / 'matlab'}'); {matlab_cmd}; exit;"
     
     print(f"Running MATLAB analysis...")
     print(f"  Experiment: {expt_path}")
@@ -70,25 +105,46 @@ def run_matlab_analysis(input_path: Path, tracks: list, output_dir: Path) -> boo
     print()
     
     try:
-        # Run MATLAB headless
-        result = subprocess.run(
-            ['matlab', '-batch', matlab_full_cmd],
-            capture_output=True,
+        # Run MATLAB headless, streaming its output line by line
+        matlab_args = ['matlab', '-batch', matlab_full_cmd]
+        with subprocess.Popen(
+            matlab_args,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
             text=True,
-            timeout=3600  # 1 hour timeout
-        )
+            bufsize=1,
+            **_PROCESS_GROUP
+        ) as process:
+            # Kill the MATLAB process tree once the timeout elapses; with
+            # every pipe holder gone the read loop reaches EOF
+            timed_out = threading.Event()
+            
+            def kill_on_timeout():
+                timed_out.set()
+                _kill_process_tree(process)
+            
+            watchdog = threading.Timer(MATLAB_TIMEOUT, kill_on_timeout)
+            watchdog.start()
+            try:
+                for line in process.stdout:
+                    if line.strip():
+                        print(f"  {line.rstrip()}", flush=True)
+                returncode = process.wait()
+            except BaseException:
+                # Don't leave MATLAB running on Ctrl+C or any other error; in
+                # its own process group it no longer receives the console's
+                # Ctrl+C itself
+                _kill_process_tree(process)
+                raise
+            finally:
+                watchdog.cancel()
         
-        if result.returncode != 0:
-            print("MATLAB Error Output:")
-            print(result.stderr)
-            print(result.stdout)
-            return False
+        if timed_out.is_set():
+            raise subprocess.TimeoutExpired(matlab_args, MATLAB_TIMEOUT)
         
-        # Print MATLAB output
-        if result.stdout:
-            for line in result.stdout.split('\n'):
-                if line.strip():
-                    print(f"  {line}")
+        if returncode != 0:
+            print(f"MATLAB exited with code {returncode} (see output above)")
+            return False
         
         # Check for success indicator
         summary_file = output_dir / 'analysis_summary.json'
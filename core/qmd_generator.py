@@ -2,10 +2,15 @@
 QMD Generator - Programmatically builds Quarto Markdown reports from analysis results.
 """
 
+import io
 import json
+import os
+import re
 from pathlib import Path
 from datetime import datetime
 
+REVERSAL_FIGURE_PATTERN = re.compile(r'reversal([1-9]\d*)_dot_product\.png')
+
 
 def generate_qmd_report(results_dir: Path, figures_dir: Path, output_dir: Path) -> Path:
     """
@@ -50,65 +55,72 @@ def generate_qmd_report(results_dir: Path, figures_dir: Path, output_dir: Path)
     ], key=lambda x: int(x.name.replace('track', '')))
     
     # Build QMD content
-    qmd_lines = []
+    qmd = io.StringIO()
     
     # YAML header with Tokyo Night theme
-    qmd_lines.append('---')
-    qmd_lines.append(f'title: "RetroVibez Analysis: {experiment_name}"')
-    qmd_lines.append(f'subtitle: "Timestamp: {timestamp}"')
-    qmd_lines.append(f'date: "{datetime.now().strftime("%Y-%m-%d")}"')
-    qmd_lines.append('highlight-style: templates/tokyo-night.theme')
-    qmd_lines.append('format:')
-    qmd_lines.append('  pdf:')
-    qmd_lines.append('    toc: true')
-    qmd_lines.append('    toc-depth: 2')
-    qmd_lines.append('    geometry:')
-    qmd_lines.append('      - margin=1in')
-    qmd_lines.append('    code-block-bg: "#1a1b26"')
-    qmd_lines.append('    code-block-border-left: "#7aa2f7"')
-    qmd_lines.append('  html:')
-    qmd_lines.append('    toc: true')
-    qmd_lines.append('    toc-depth: 2')
-    qmd_lines.append('    embed-resources: true')
-    qmd_lines.append('    theme:')
-    qmd_lines.append('      dark: darkly')
-    qmd_lines.append('    code-block-bg: "#1a1b26"')
-    qmd_lines.append('    code-block-border-left: "#7aa2f7"')
-    qmd_lines.append('---')
-    qmd_lines.append('')
+    print('---', file=qmd)
+    print(f'title: "RetroVibez Analysis: {experiment_name}"', file=qmd)
+    print(f'subtitle: "Timestamp: {timestamp}"', file=qmd)
+    print(f'date: "{datetime.now().strftime("%Y-%m-%d")}"', file=qmd)
+    print('highlight-style: templates/tokyo-night.theme', file=qmd)
+    print('format:', file=qmd)
+    print('  pdf:', file=qmd)
+    print('    toc: true', file=qmd)
+    print('    toc-depth: 2', file=qmd)
+    print('    geometry:', file=qmd)
+    print('      - margin=1in', file=qmd)
+    print('    code-block-bg: "#1a1b26"', file=qmd)
+    print('    code-block-border-left: "#7aa2f7"', file=qmd)
+    print('  html:', file=qmd)
+    print('    toc: true', file=qmd)
+    print('    toc-depth: 2', file=qmd)
+    print('    embed-resources: true', file=qmd)
+    print('    theme:', file=qmd)
+    print('      dark: darkly', file=qmd)
+    print('    code-block-bg: "#1a1b26"', file=qmd)
+    print('    code-block-border-left: "#7aa2f7"', file=qmd)
+    print('---', file=qmd)
+    print(file=qmd)
     
     # Summary section
-    qmd_lines.append('# Summary')
-    qmd_lines.append('')
-    qmd_lines.append(f"**Experiment:** {experiment_name}")
-    qmd_lines.append('')
-    qmd_lines.append(f"**Timestamp:** {timestamp}")
-    qmd_lines.append('')
-    qmd_lines.append(f"**Total Tracks Analyzed:** {summary.get('total_tracks', len(track_dirs))}")
-    qmd_lines.append('')
-    qmd_lines.append(f"**Tracks with Reversals:** {summary.get('tracks_with_reversals', 'N/A')}")
-    qmd_lines.append('')
-    qmd_lines.append(f"**Total Reversals Detected:** {summary.get('total_reversals', 'N/A')}")
-    qmd_lines.append('')
+    print('# Summary', file=qmd)
+    print(file=qmd)
+    print(f"**Experiment:** {experiment_name}", file=qmd)
+    print(file=qmd)
+    print(f"**Timestamp:** {timestamp}", file=qmd)
+    print(file=qmd)
+    print(f"**Total Tracks Analyzed:** {summary.get('total_tracks', len(track_dirs))}", file=qmd)
+    print(file=qmd)
+    print(f"**Tracks with Reversals:** {summary.get('tracks_with_reversals', 'N/A')}", file=qmd)
+    print(file=qmd)
+    print(f"**Total Reversals Detected:** {summary.get('total_reversals', 'N/A')}", file=qmd)
+    print(file=qmd)
     
     if summary.get('avg_reversal_duration'):
-        qmd_lines.append(f"**Average Reversal Duration:** {summary.get('avg_reversal_duration'):.2f} s")
-        qmd_lines.append('')
-        qmd_lines.append(f"**Min/Max Duration:** {summary.get('min_reversal_duration'):.2f} s / {summary.get('max_reversal_duration'):.2f} s")
-        qmd_lines.append('')
+        print(f"**Average Reversal Duration:** {summary.get('avg_reversal_duration'):.2f} s", file=qmd)
+        print(file=qmd)
+        print(f"**Min/Max Duration:** {summary.get('min_reversal_duration'):.2f} s / {summary.get('max_reversal_duration'):.2f} s", file=qmd)
+        print(file=qmd)
     
-    qmd_lines.append('---')
-    qmd_lines.append('')
+    print('---', file=qmd)
+    print(file=qmd)
     
     # Track sections
-    qmd_lines.append('# Individual Track Analysis')
-    qmd_lines.append('')
+    print('# Individual Track Analysis', file=qmd)
+    print(file=qmd)
+    
+    # Figure paths are written relative to output_dir
+    rel_figures = figures_dir.relative_to(output_dir) if figures_dir.is_relative_to(output_dir) else figures_dir
     
     for track_dir in track_dirs:
         track_num = int(track_dir.name.replace('track', ''))
         
-        qmd_lines.append(f'## Track {track_num}')
-        qmd_lines.append('')
+        # One directory listing per track instead of a stat() per figure
+        with os.scandir(track_dir) as entries:
+            existing = {entry.name for entry in entries}
+        
+        print(f'## Track {track_num}', file=qmd)
+        print(file=qmd)
         
         # Find track info from fig_summary
         track_info = next(
@@ -117,54 +129,53 @@ def generate_qmd_report(results_dir: Path, figures_dir: Path, output_dir: Path)
         )
         num_reversals = track_info.get('reversals', 0)
         
-        qmd_lines.append(f"**Reversals detected:** {num_reversals}")
-        qmd_lines.append('')
+        print(f"**Reversals detected:** {num_reversals}", file=qmd)
+        print(file=qmd)
         
-        # Dot product figure (relative path from output_dir to figures_dir)
-        rel_figures = figures_dir.relative_to(output_dir) if figures_dir.is_relative_to(output_dir) else figures_dir
-        
-        dot_product_path = track_dir / 'dot_product.png'
-        if dot_product_path.exists():
+        # Dot product figure
+        if 'dot_product.png' in existing:
             rel_path = f"{rel_figures.name}/{track_dir.name}/dot_product.png"
-            qmd_lines.append(f'### Dot Product Over Time')
-            qmd_lines.append('')
-            qmd_lines.append(f'![Track {track_num} - Dot Product]({rel_path}){{width=100%}}')
-            qmd_lines.append('')
+            print(f'### Dot Product Over Time', file=qmd)
+            print(file=qmd)
+            print(f'![Track {track_num} - Dot Product]({rel_path}){{width=100%}}', file=qmd)
+            print(file=qmd)
         
         # Trajectory figure
-        trajectory_path = track_dir / 'trajectory.png'
-        if trajectory_path.exists():
+        if 'trajectory.png' in existing:
             rel_path = f"{rel_figures.name}/{track_dir.name}/trajectory.png"
-            qmd_lines.append(f'### Trajectory')
-            qmd_lines.append('')
-            qmd_lines.append(f'![Track {track_num} - Trajectory]({rel_path}){{width=80%}}')
-            qmd_lines.append('')
+            print(f'### Trajectory', file=qmd)
+            print(file=qmd)
+            print(f'![Track {track_num} - Trajectory]({rel_path}){{width=80%}}', file=qmd)
+            print(file=qmd)
         
         # Reversal-specific figures
         if num_reversals > 0:
-            qmd_lines.append(f'### Reversal Details')
-            qmd_lines.append('')
+            print(f'### Reversal Details', file=qmd)
+            print(file=qmd)
             
-            for r_idx in range(1, num_reversals + 1):
-                rev_dot_path = track_dir / f'reversal{r_idx}_dot_product.png'
-                if rev_dot_path.exists():
-                    rel_path = f"{rel_figures.name}/{track_dir.name}/reversal{r_idx}_dot_product.png"
-                    qmd_lines.append(f'#### Reversal {r_idx}')
-                    qmd_lines.append('')
-                    qmd_lines.append(f'![Reversal {r_idx} Close-up]({rel_path}){{width=90%}}')
-                    qmd_lines.append('')
+            # Close-ups that were actually generated, in reversal order; the
+            # figure directory may be reused, so ignore leftovers numbered
+            # beyond this run's reversal count
+            rev_figures = sorted(
+                (int(match.group(1)), match.group(0))
+                for match in map(REVERSAL_FIGURE_PATTERN.fullmatch, existing)
+                if match and int(match.group(1)) <= num_reversals
+            )
+            for r_idx, rev_name in rev_figures:
+                rel_path = f"{rel_figures.name}/{track_dir.name}/{rev_name}"
+                print(f'#### Reversal {r_idx}', file=qmd)
+                print(file=qmd)
+                print(f'![Reversal {r_idx} Close-up]({rel_path}){{width=90%}}', file=qmd)
+                print(file=qmd)
         
-        qmd_lines.append('---')
-        qmd_lines.append('')
-        qmd_lines.append('\\newpage')
-        qmd_lines.append('')
+        print('---', file=qmd)
+        print(file=qmd)
+        print('\\newpage', file=qmd)
+        print(file=qmd)
     
     # Write QMD file
-    qmd_content = '\n'.join(qmd_lines)
     qmd_path = output_dir / 'mason_analysis_report.qmd'
-    
-    with open(qmd_path, 'w', encoding='utf-8') as f:
-        f.write(qmd_content)
+    qmd_path.write_text(qmd.getvalue(), encoding='utf-8')
     
     print(f"Generated QMD report: {qmd_path}")
     print(f"  Tracks documented: {len(track_dirs)}")
@@ -2,9 +2,35 @@
 Report Renderer - Renders QMD files to PDF and HTML using Quarto.
 """
 
+import shutil
 import subprocess
 from pathlib import Path
 
+# Resolved once; falls back to the bare name so a missing Quarto still
+# surfaces as FileNotFoundError below
+QUARTO_EXECUTABLE = shutil.which('quarto') or 'quarto'
+RENDER_FORMATS = ('pdf', 'html')
+
+
+def _run_quarto(qmd_path: Path, formats: str):
+    """Run a single `quarto render` for the given comma-separated formats"""
+    return subprocess.run(
+        [QUARTO_EXECUTABLE, 'render', str(qmd_path), '--to', formats],
+        capture_output=True,
+        text=True,
+        cwd=qmd_path.parent,
+        timeout=300  # 5 minute timeout
+    )
+
+
+def _output_stamp(output_path: Path):
+    """Identity of an output file's current contents, or None if it is missing"""
+    try:
+        stat = output_path.stat()
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
 
 def render_report(qmd_path: Path) -> bool:
     """
@@ -25,39 +51,27 @@ def render_report(qmd_path: Path) -> bool:
     print(f"Rendering report: {qmd_path.name}")
     
     try:
-        # Render to both PDF and HTML
-        result = subprocess.run(
-            ['quarto', 'render', str(qmd_path), '--to', 'pdf,html'],
-            capture_output=True,
-            text=True,
-            cwd=qmd_path.parent,
-            timeout=300  # 5 minute timeout
-        )
+        # Render to both PDF and HTML in one Quarto startup. Outputs are
+        # compared against a pre-render snapshot, not the wall clock, since
+        # file mtimes use a coarser (or, on network shares, skewed) clock
+        before = {fmt: _output_stamp(qmd_path.with_suffix(f'.{fmt}')) for fmt in RENDER_FORMATS}
+        result = _run_quarto(qmd_path, ','.join(RENDER_FORMATS))
         
         if result.returncode != 0:
             print("Quarto Error:")
             print(result.stderr)
             
-            # Try rendering formats separately
-            print("\nTrying PDF only...")
-            pdf_result = subprocess.run(
-                ['quarto', 'render', str(qmd_path), '--to', 'pdf'],
-                capture_output=True,
-                text=True,
-                cwd=qmd_path.parent,
-                timeout=300
-            )
-            
-            print("Trying HTML only...")
-            html_result = subprocess.run(
-                ['quarto', 'render', str(qmd_path), '--to', 'html'],
-                capture_output=True,
-                text=True,
-                cwd=qmd_path.parent,
-                timeout=300
-            )
+            # Re-render only the formats the combined run did not produce
+            failed = []
+            for fmt in RENDER_FORMATS:
+                stamp = _output_stamp(qmd_path.with_suffix(f'.{fmt}'))
+                if stamp is not None and stamp != before[fmt]:
+                    continue
+                print(f"\nTrying {fmt.upper()} only...")
+                if _run_quarto(qmd_path, fmt).returncode != 0:
+                    failed.append(fmt)
             
-            if pdf_result.returncode != 0 and html_result.returncode != 0:
+            if len(failed) == len(RENDER_FORMATS):
                 return False
         
         # Check output files
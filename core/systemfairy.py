@@ -3,12 +3,169 @@ System Fairy - Environment verification for Mason Analysis Pipeline.
 Checks all required dependencies before allowing analysis to run.
 """
 
-import sys
+import asyncio
+import os
 import shutil
+import stat
+import sys
+import functools
+import hashlib
+import importlib.util
+import io
+import json
 import subprocess
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from xml.etree import ElementTree
+
+
+_PIPELINE_ROOT = Path(__file__).resolve().parent.parent
+
+# Executables the checks look up; on Windows resolved together in one PATH sweep
+TEX_EXECUTABLES = ('tlmgr', 'pdflatex', 'xelatex')
+EXECUTABLES = ('matlab', 'quarto') + TEX_EXECUTABLES
+
+_which_cache = {}
+
+# Slow subprocess probes as (command, timeout in seconds)
+MATLAB_VERSION_PROBE = (('matlab', '-nojvm', '-batch', 'disp(version)'), 15)
+QUARTO_VERSION_PROBE = (('quarto', '--version'), 10)
+QUARTO_CHECK_PROBE = (('quarto', 'check'), 10)
+
+_probe_cache = {}
+
+# Passing results persist across runs until PATH changes or they go stale
+ENVCHECK_CACHE = Path.home() / '.retrovibez' / 'envcheck.json'
+ENVCHECK_TTL = 24 * 60 * 60
+
+
+def _bulk_which(names):
+    """
+    Locate several executables with a single pass over PATH (Windows).
+    
+    Like shutil.which, the current directory is searched first, the first
+    directory containing a match wins, PATHEXT order breaks ties within a
+    directory and a name that already has a PATHEXT extension is matched
+    as-is. Each directory is listed once with os.scandir instead of
+    stat-ing every name/extension pair.
+    
+    Returns:
+        Dict mapping each name to its full path, or None if not found
+    """
+    found = dict.fromkeys(names)
+    pathext = [ext.lower() for ext in os.environ.get('PATHEXT', '.COM;.EXE;.BAT;.CMD').split(os.pathsep) if ext]
+    candidates = {}
+    for name in names:
+        if any(name.lower().endswith(ext) for ext in pathext):
+            candidates[name.lower()] = (name, 0)
+        else:
+            candidates.update((f'{name}{ext}'.lower(), (name, rank)) for rank, ext in enumerate(pathext))
+    
+    directories = os.environ.get('PATH', os.defpath).split(os.pathsep)
+    if 'NoDefaultCurrentDirectoryInExePath' not in os.environ:
+        directories.insert(0, os.curdir)
+    
+    remaining = set(names)
+    for directory in directories:
+        if not remaining:
+            break
+        hits = {}
+        try:
+            with os.scandir(directory or os.curdir) as entries:
+                for entry in entries:
+                    match = candidates.get(entry.name.lower())
+                    if match is None or match[0] not in remaining:
+                        continue
+                    name, rank = match
+                    if entry.is_file() and os.access(entry.path, os.X_OK):
+                        if name not in hits or rank < hits[name][0]:
+                            hits[name] = (rank, entry.path)
+        except OSError:
+            continue
+        for name, (_, path) in hits.items():
+            found[name] = path
+            remaining.discard(name)
+    
+    return found
+
+
+def _prime_which(names=EXECUTABLES):
+    """Resolve any not-yet-cached executables"""
+    uncached = tuple(name for name in names if name not in _which_cache)
+    if not uncached:
+        return
+    # Only Windows needs the sweep (one stat per PATHEXT extension per
+    # directory); elsewhere shutil.which stops at the first hit and is faster
+    if sys.platform == 'win32':
+        _which_cache.update(_bulk_which(uncached))
+    else:
+        _which_cache.update((name, shutil.which(name)) for name in uncached)
+
+
+def _which(name):
+    """Memoized executable lookup (None if not on PATH)"""
+    _prime_which((name,))
+    return _which_cache[name]
+
+
+async def _probe(cmd, timeout):
+    """
+    Run a command without blocking the event loop.
+    
+    Returns:
+        Tuple of (returncode, stdout, stderr)
+    
+    Raises:
+        subprocess.TimeoutExpired: The command was killed after `timeout` seconds
+    """
+    # Capture into temporary files rather than pipes: waiting on a killed
+    # process would otherwise also wait for pipe EOF, which a grandchild
+    # (MATLAB's launcher starts one) can hold off long after the kill
+    with tempfile.TemporaryFile() as out, tempfile.TemporaryFile() as err:
+        proc = await asyncio.create_subprocess_exec(*cmd, stdout=out, stderr=err)
+        try:
+            await asyncio.wait_for(proc.wait(), timeout)
+        except asyncio.TimeoutError:
+            proc.kill()
+            await proc.wait()
+            raise subprocess.TimeoutExpired(cmd, timeout)
+        
+        out.seek(0)
+        err.seek(0)
+        return proc.returncode, out.read().decode(errors='replace'), err.read().decode(errors='replace')
+
+
+async def _gather_probes(probes):
+    """Run probes concurrently; failures are returned as exception objects"""
+    results = await asyncio.gather(
+        *(_probe(cmd, timeout) for cmd, timeout in probes),
+        return_exceptions=True
+    )
+    return {cmd: result for (cmd, _), result in zip(probes, results)}
+
 
+def _prime_probes(probes):
+    """Run any not-yet-cached probes together on one event loop"""
+    pending = tuple(probe for probe in probes if probe[0] not in _probe_cache)
+    if pending:
+        # Own thread for the loop: the caller may already be running one
+        # (e.g. a Jupyter notebook), where asyncio.run() refuses to start
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            _probe_cache.update(executor.submit(asyncio.run, _gather_probes(pending)).result())
 
+
+def _run_probe(probe):
+    """Memoized subprocess probe; re-raises the probe's exception, if any"""
+    _prime_probes((probe,))
+    result = _probe_cache[probe[0]]
+    if isinstance(result, BaseException):
+        raise result
+    return result
+
+
+@functools.lru_cache(maxsize=1)
 def check_python_version():
     """Check Python version >= 3.8"""
     version = sys.version_info
@@ -17,18 +174,20 @@ def check_python_version():
     return ok, detail
 
 
+@functools.lru_cache(maxsize=1)
 def check_python_packages():
     """Check required Python packages are installed"""
     required = ['numpy', 'matplotlib', 'h5py', 'jupyter']
     missing = []
     installed = []
     
+    # Locate each package without importing it (numpy/matplotlib imports
+    # are slow and have side effects such as backend selection)
     for pkg in required:
-        try:
-            __import__(pkg)
-            installed.append(pkg)
-        except ImportError:
+        if importlib.util.find_spec(pkg) is None:
             missing.append(pkg)
+        else:
+            installed.append(pkg)
     
     ok = len(missing) == 0
     if ok:
@@ -36,56 +195,114 @@ def check_python_packages():
     else:
         detail = f"Missing: {', '.join(missing)}"
     
-    return ok, detail, missing
+    return ok, detail, tuple(missing)
 
 
-def check_matlab():
-    """Check MATLAB is installed and accessible"""
-    matlab_path = shutil.which('matlab')
+@functools.lru_cache(maxsize=None)
+def read_matlab_version_info(matlab_path):
+    """
+    Read the MATLAB version from <matlabroot>/VersionInfo.xml.
+    
+    Returns:
+        Version string such as "24.1.0.2537033 (R2024a)", or None if the
+        file is missing or unreadable
+    """
+    matlab_root = Path(matlab_path).resolve().parent.parent
+    try:
+        info = ElementTree.parse(matlab_root / 'VersionInfo.xml').getroot()
+    except (OSError, ElementTree.ParseError):
+        return None
+    
+    version = info.findtext('version')
+    release = info.findtext('release')
+    if not version:
+        return None
+    return f"{version} ({release})" if release else version
+
+
+def _matlab_probe(detailed):
+    """Probe check_matlab(detailed) has to run, or None"""
+    matlab_path = _which('matlab')
+    if detailed and matlab_path and not read_matlab_version_info(matlab_path):
+        return MATLAB_VERSION_PROBE
+    return None
+
+
+@functools.lru_cache(maxsize=None)
+def check_matlab(detailed=False):
+    """
+    Check MATLAB is installed and accessible.
+    
+    Args:
+        detailed: Fall back to starting MATLAB for its version when
+            VersionInfo.xml is unavailable (slow)
+    """
+    matlab_path = _which('matlab')
     ok = matlab_path is not None
     
     if ok:
-        # Try to get version
-        try:
-            result = subprocess.run(
-                ['matlab', '-batch', 'disp(version)'],
-                capture_output=True,
-                text=True,
-                timeout=60
-            )
-            version = result.stdout.strip().split('\n')[-1] if result.returncode == 0 else 'unknown'
+        # Read the version from the install tree; starting MATLAB is a last resort
+        version = read_matlab_version_info(matlab_path)
+        probe = _matlab_probe(detailed)
+        if version:
             detail = f"{matlab_path} (v{version})"
-        except Exception:
+        elif probe is None:
             detail = matlab_path
+        else:
+            # -nojvm skips the Java boot; the probe kills the process on timeout
+            try:
+                returncode, stdout, _ = _run_probe(probe)
+                version = stdout.strip().splitlines()[-1] if returncode == 0 and stdout.strip() else 'unknown'
+                detail = f"{matlab_path} (v{version})"
+            except subprocess.TimeoutExpired:
+                # Hung start-up (e.g. unreachable license server) still means installed
+                detail = f"{matlab_path} (installed, version unknown)"
+            except Exception:
+                detail = matlab_path
     else:
         detail = "Not found in PATH"
     
     return ok, detail
 
 
+@functools.lru_cache(maxsize=1)
 def check_matlab_engine():
     """Check MATLAB Engine for Python is installed"""
-    try:
-        import matlab.engine
+    # Locate the package without importing it: importing matlab.engine loads
+    # MATLAB's native runtime libraries. find_spec('matlab.engine') would
+    # still import the parent package, so look inside matlab's search path.
+    spec = importlib.util.find_spec('matlab')
+    locations = spec.submodule_search_locations if spec else None
+    if locations and any(Path(location, 'engine', '__init__.py').is_file() for location in locations):
         return True, "Installed"
-    except ImportError:
-        return False, "Not installed (install from MATLAB/extern/engines/python)"
+    return False, "Not installed (install from MATLAB/extern/engines/python)"
 
 
-def check_quarto():
-    """Check Quarto is installed"""
-    quarto_path = shutil.which('quarto')
+def _quarto_probe(detailed):
+    """Probe check_quarto(detailed) has to run, or None"""
+    if detailed and _which('quarto'):
+        return QUARTO_VERSION_PROBE
+    return None
+
+
+@functools.lru_cache(maxsize=None)
+def check_quarto(detailed=False):
+    """
+    Check Quarto is installed.
+    
+    Args:
+        detailed: Also run `quarto --version` to report the version
+    """
+    quarto_path = _which('quarto')
     ok = quarto_path is not None
+    probe = _quarto_probe(detailed)
     
-    if ok:
+    if ok and probe is None:
+        detail = quarto_path
+    elif ok:
         try:
-            result = subprocess.run(
-                ['quarto', '--version'],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            version = result.stdout.strip() if result.returncode == 0 else 'unknown'
+            returncode, stdout, _ = _run_probe(probe)
+            version = stdout.strip() if returncode == 0 else 'unknown'
             detail = f"{quarto_path} (v{version})"
         except Exception:
             detail = quarto_path
@@ -95,31 +312,49 @@ def check_quarto():
     return ok, detail
 
 
+def _tex_path():
+    """First TeX tool found on PATH, or None"""
+    for tex_tool in TEX_EXECUTABLES:
+        tex_path = _which(tex_tool)
+        if tex_path:
+            return tex_path
+    return None
+
+
+def _tinytex_probe():
+    """Probe check_tinytex() has to run, or None"""
+    if _tex_path() is None and _which('quarto'):
+        return QUARTO_CHECK_PROBE
+    return None
+
+
+@functools.lru_cache(maxsize=1)
 def check_tinytex():
     """Check TinyTeX is installed (for PDF rendering)"""
+    # Any TeX distribution on PATH is enough; no need to start Quarto
+    tex_path = _tex_path()
+    if tex_path:
+        return True, f"TeX distribution found: {tex_path}"
+    
+    probe = _tinytex_probe()
+    if probe is None:
+        return False, "Not installed (run: quarto install tinytex)"
+    
+    # Last resort: ask Quarto (slow, boots its Deno runtime)
     try:
-        result = subprocess.run(
-            ['quarto', 'check'],
-            capture_output=True,
-            text=True,
-            timeout=30
-        )
+        _, stdout, stderr = _run_probe(probe)
         # Check if TinyTeX or LaTeX is mentioned as OK
-        output = result.stdout + result.stderr
+        output = stdout + stderr
         if 'tinytex' in output.lower() or 'latex' in output.lower():
             if 'OK' in output or 'installed' in output.lower():
                 return True, "TinyTeX installed"
         
-        # Try to find tlmgr (TeX Live Manager)
-        tlmgr_path = shutil.which('tlmgr')
-        if tlmgr_path:
-            return True, f"TeX distribution found: {tlmgr_path}"
-        
         return False, "Not installed (run: quarto install tinytex)"
     except Exception:
         return False, "Could not check (run: quarto install tinytex)"
 
 
+@functools.lru_cache(maxsize=1)
 def check_magat_codebase():
     """Check if MAGAT codebase is accessible (for MATLAB classes)"""
     # Check common locations
@@ -130,150 +365,266 @@ def check_magat_codebase():
     ]
     
     # Also check environment variable
-    import os
     env_path = os.environ.get('MAGAT_CODEBASE')
     if env_path:
         possible_paths.insert(0, Path(env_path))
     
+    # A single stat of <candidate>/analySis proves both directories exist
     for p in possible_paths:
-        if p.exists() and (p / 'analySis').exists():
-            return True, str(p)
+        try:
+            if stat.S_ISDIR(os.stat(p / 'analySis').st_mode):
+                return True, str(p)
+        except OSError:
+            continue
     
     # Check if ExperimentSet is available in MATLAB path
     # (might be added via startup.m)
     return True, "Assuming MATLAB path configured"
 
 
-def run_systemfairy(verbose=True):
+# Install instructions per missing component, in display order
+_INSTALL_HELP = {
+    'python': (
+        "  Python 3.8+:\n"
+        "    winget install Python.Python.3.11 --accept-source-agreements --accept-package-agreements\n"
+    ),
+    'packages': (
+        "  Python packages:\n"
+        f"    pip install -r \"{_PIPELINE_ROOT / 'requirements.txt'}\"\n"
+    ),
+    'matlab': (
+        "  MATLAB:\n"
+        "    Install from https://www.mathworks.com/products/matlab.html\n"
+        "    Ensure 'matlab' is in your PATH\n"
+    ),
+    'matlab_engine': (
+        "  MATLAB Engine for Python:\n"
+        "    cd \"<MATLAB_ROOT>/extern/engines/python\"\n"
+        "    python -m pip install .\n"
+        "    # Windows: C:\\Program Files\\MATLAB\\R2024a\\extern\\engines\\python\n"
+        "    # macOS:   /Applications/MATLAB_R2024a.app/extern/engines/python\n"
+        "    # Linux:   /usr/local/MATLAB/R2024a/extern/engines/python\n"
+    ),
+    'quarto': (
+        "  Quarto (non-interactive):\n"
+        "    winget install Posit.Quarto --accept-source-agreements --accept-package-agreements\n"
+        "    # Or download from: https://quarto.org/docs/download/\n"
+    ),
+    'tinytex': (
+        "  TinyTeX (for PDF rendering):\n"
+        "    quarto install tinytex --update-path\n"
+    ),
+}
+
+# Status icons indexed by int(ok)
+_ICONS = ("[X]", "[OK]")
+
+# Missing packages that are covered by the requirements.txt help entry
+_REQUIREMENTS_PACKAGES = ('numpy', 'matplotlib', 'h5py')
+
+
+def clear_cache():
+    """Forget cached check results so the next run re-probes everything"""
+    _which_cache.clear()
+    _probe_cache.clear()
+    read_matlab_version_info.cache_clear()
+    for check in (check_python_version, check_python_packages, check_matlab,
+                  check_matlab_engine, check_quarto, check_tinytex, check_magat_codebase):
+        check.cache_clear()
+
+
+def check_tinytex_after_quarto(results, detailed):
+    """Check TinyTeX only when the Quarto probe succeeded"""
+    if not results['Quarto'][0]:
+        return False, "Skipped: Quarto missing"
+    return check_tinytex()
+
+
+# Execution plan: (label, missing-component key, check) grouped in layers.
+# Checks within a layer run concurrently and receive the results of all
+# earlier layers, keyed by label, plus the run's `detailed` flag.
+CHECK_LAYERS = [
+    [
+        ('Python >= 3.8', 'python', lambda results, detailed: check_python_version()),
+        ('Python packages', None, lambda results, detailed: check_python_packages()),
+        ('MATLAB', 'matlab', lambda results, detailed: check_matlab(detailed)),
+        ('MATLAB Engine', 'matlab_engine', lambda results, detailed: check_matlab_engine()),
+        ('Quarto', 'quarto', lambda results, detailed: check_quarto(detailed)),
+        ('MAGAT codebase', 'magat', lambda results, detailed: check_magat_codebase()),
+    ],
+    [
+        ('TinyTeX (PDF)', 'tinytex', check_tinytex_after_quarto),
+    ],
+]
+
+CHECK_DISPLAY_ORDER = [
+    'Python >= 3.8', 'Python packages', 'MATLAB', 'MATLAB Engine',
+    'Quarto', 'TinyTeX (PDF)', 'MAGAT codebase',
+]
+
+
+def run_systemfairy(verbose=True, detailed=False):
     """
     Run all environment checks.
     
+    Args:
+        verbose: Print the report and install instructions
+        detailed: Also query MATLAB/Quarto version strings (slow; only
+            needed for diagnostics)
+    
     Returns:
         Tuple of (all_ok, missing_items)
     """
     checks = []
     missing = []
     
-    # Python version
-    ok, detail = check_python_version()
-    checks.append(('Python >= 3.8', ok, detail))
-    if not ok:
-        missing.append('python')
-    
-    # Python packages
-    ok, detail, missing_pkgs = check_python_packages()
-    checks.append(('Python packages', ok, detail))
-    if not ok:
-        missing.extend(missing_pkgs)
-    
-    # MATLAB
-    ok, detail = check_matlab()
-    checks.append(('MATLAB', ok, detail))
-    if not ok:
-        missing.append('matlab')
-    
-    # MATLAB Engine for Python
-    ok, detail = check_matlab_engine()
-    checks.append(('MATLAB Engine', ok, detail))
-    if not ok:
-        missing.append('matlab_engine')
+    # Resolve every executable the checks look up in one go
+    _prime_which()
     
-    # Quarto
-    ok, detail = check_quarto()
-    checks.append(('Quarto', ok, detail))
-    if not ok:
-        missing.append('quarto')
+    # Start every subprocess probe the checks will need at once, on a single
+    # event loop, so the worker threads below only read finished results
+    probes = (_matlab_probe(detailed), _quarto_probe(detailed), _tinytex_probe())
+    _prime_probes([probe for probe in probes if probe is not None])
     
-    # TinyTeX (for PDF)
-    ok, detail = check_tinytex()
-    checks.append(('TinyTeX (PDF)', ok, detail))
-    if not ok:
-        missing.append('tinytex')
+    # Run each layer concurrently; checks mostly wait on subprocesses or
+    # the filesystem, and later layers can short-circuit on earlier results
+    results = {}
+    missing_keys = {}
+    with ThreadPoolExecutor(max_workers=max(len(layer) for layer in CHECK_LAYERS)) as executor:
+        for layer in CHECK_LAYERS:
+            layer_results = executor.map(lambda entry: entry[2](results, detailed), layer)
+            for (label, missing_key, _), result in zip(layer, layer_results):
+                results[label] = result
+                missing_keys[label] = missing_key
     
-    # MAGAT codebase
-    ok, detail = check_magat_codebase()
-    checks.append(('MAGAT codebase', ok, detail))
-    if not ok:
-        missing.append('magat')
+    for label in CHECK_DISPLAY_ORDER:
+        result = results[label]
+        ok, detail = result[0], result[1]
+        checks.append((label, ok, detail))
+        if not ok:
+            # check_python_packages reports its own list of missing packages
+            missing.extend(result[2] if len(result) > 2 else [missing_keys[label]])
     
     if verbose:
-        print("=" * 60)
-        print("  System Fairy - Environment Check")
-        print("=" * 60)
-        print()
+        # Assemble the whole report, then emit it with a single write
+        report = io.StringIO()
+        print("=" * 60, file=report)
+        print("  System Fairy - Environment Check", file=report)
+        print("=" * 60, file=report)
+        print(file=report)
         
         for label, ok, detail in checks:
-            icon = "[OK]" if ok else "[X]"
-            print(f"  {icon} {label}: {detail}")
+            print(f"  {_ICONS[int(ok)]} {label}: {detail}", file=report)
         
-        print()
+        print(file=report)
         
         if missing:
-            print("Missing components detected. Installation commands:")
-            print()
-            
-            if 'python' in missing:
-                print("  Python 3.8+:")
-                print("    winget install Python.Python.3.11 --accept-source-agreements --accept-package-agreements")
-                print()
-            
-            if any(p in missing for p in ['numpy', 'matplotlib', 'h5py']):
-                pipeline_root = Path(__file__).parent.parent
-                print("  Python packages:")
-                print(f"    pip install -r \"{pipeline_root / 'requirements.txt'}\"")
-                print()
-            
-            if 'matlab' in missing:
-                print("  MATLAB:")
-                print("    Install from https://www.mathworks.com/products/matlab.html")
-                print("    Ensure 'matlab' is in your PATH")
-                print()
+            print("Missing components detected. Installation commands:", file=report)
+            print(file=report)
             
-            if 'matlab_engine' in missing:
-                print("  MATLAB Engine for Python:")
-                print("    cd \"<MATLAB_ROOT>/extern/engines/python\"")
-                print("    python -m pip install .")
-                print("    # Windows: C:\\Program Files\\MATLAB\\R2024a\\extern\\engines\\python")
-                print("    # macOS:   /Applications/MATLAB_R2024a.app/extern/engines/python")
-                print("    # Linux:   /usr/local/MATLAB/R2024a/extern/engines/python")
-                print()
+            # Packages share one help entry; other keys map one-to-one
+            help_keys = {'packages' if key in _REQUIREMENTS_PACKAGES else key for key in missing}
+            for key, help_text in _INSTALL_HELP.items():
+                if key in help_keys:
+                    print(help_text, file=report)
             
-            if 'quarto' in missing:
-                print("  Quarto (non-interactive):")
-                print("    winget install Posit.Quarto --accept-source-agreements --accept-package-agreements")
-                print("    # Or download from: https://quarto.org/docs/download/")
-                print()
-            
-            if 'tinytex' in missing:
-                print("  TinyTeX (for PDF rendering):")
-                print("    quarto install tinytex --update-path")
-                print()
-            
-            print("-" * 60)
-            print("Run this to install all missing components (admin PowerShell):")
-            print()
-            print("  # Python packages")
-            print(f"  pip install numpy matplotlib h5py")
-            print()
-            print("  # Quarto")
-            print("  winget install Posit.Quarto --accept-source-agreements --accept-package-agreements")
-            print("-" * 60)
-            
-            return False, missing
+            print("-" * 60, file=report)
+            print("Run this to install all missing components (admin PowerShell):", file=report)
+            print(file=report)
+            print("  # Python packages", file=report)
+            print(f"  pip install numpy matplotlib h5py", file=report)
+            print(file=report)
+            print("  # Quarto", file=report)
+            print("  winget install Posit.Quarto --accept-source-agreements --accept-package-agreements", file=report)
+            print("-" * 60, file=report)
         else:
-            print("All requirements satisfied!")
-            return True, []
+            print("All requirements satisfied!", file=report)
+        
+        sys.stdout.write(report.getvalue())
+        sys.stdout.flush()
     
     all_ok = len(missing) == 0
     return all_ok, missing
 
 
-def ensure_requirements():
+def _environment_key():
+    """
+    Fingerprint of PATH and the running interpreter; any change invalidates
+    the persisted result (package and MATLAB engine checks are per-interpreter)
+    """
+    fingerprint = f"{sys.executable}\0{os.environ.get('PATH', '')}"
+    return hashlib.sha256(fingerprint.encode()).hexdigest()
+
+
+def load_cached_result():
+    """True if a passing check for this PATH and interpreter was saved within ENVCHECK_TTL"""
+    try:
+        cached = json.loads(ENVCHECK_CACHE.read_text())
+    except (OSError, ValueError):
+        return False
+    
+    if not isinstance(cached, dict):
+        return False
+    
+    timestamp = cached.get('ts')
+    return (
+        cached.get('ok') is True
+        and cached.get('key') == _environment_key()
+        and isinstance(timestamp, (int, float))
+        and not isinstance(timestamp, bool)
+        and 0 <= time.time() - timestamp < ENVCHECK_TTL
+    )
+
+
+def save_cached_result():
+    """Record a passing check for the current PATH and interpreter (best effort)"""
+    try:
+        ENVCHECK_CACHE.parent.mkdir(parents=True, exist_ok=True)
+        ENVCHECK_CACHE.write_text(json.dumps({
+            'key': _environment_key(),
+            'ts': time.time(),
+            'ok': True,
+        }))
+    except OSError:
+        pass
+
+
+def run_systemfairy_cached(verbose=True, force_recheck=False):
+    """
+    Run the environment checks unless they recently passed with this PATH
+    and interpreter.
+    
+    Only all-OK results are persisted, so a missing component is re-probed
+    on every launch until it is installed.
+    
+    Args:
+        verbose: Print the report and install instructions
+        force_recheck: Ignore the persisted result and probe everything
+    
+    Returns:
+        Tuple of (all_ok, missing_items)
+    """
+    if not force_recheck and load_cached_result():
+        if verbose:
+            print("  [OK] Environment verified within the last 24 hours "
+                  "(use --force-recheck to re-probe)")
+        return True, []
+    
+    ok, missing = run_systemfairy(verbose=verbose)
+    if ok:
+        save_cached_result()
+    return ok, missing
+
+
+def ensure_requirements(force_recheck=False):
     """
     Check requirements and exit if not met.
     Called at the start of the pipeline.
+    
+    Args:
+        force_recheck: Ignore a recent passing result and probe everything
     """
-    ok, missing = run_systemfairy(verbose=True)
+    ok, missing = run_systemfairy_cached(verbose=True, force_recheck=force_recheck)
     
     if not ok:
         print()
@@ -284,5 +635,5 @@ def ensure_requirements():
 
 
 if __name__ == '__main__':
-    run_systemfairy()
+    run_systemfairy(verbose=True, detailed=True)
 